@@ -3,14 +3,22 @@ This module provide some utilities about file I/O.
 
 Functions:
     - is_hidden: check if a file is hidden or not.
+    - scan_dir: extract directory and file lists in a directory at once.
+    - walk_files: walk a directory tree recursively and yield file entries.
     - extract_directory: extract directory list in a directory.
     - extract_file: extract file list in a directory.
     - expand_relative_path: expand relative path and convert into absolute path.
     - check_file_extension: check extension in a file path.
+    - extension_checker: build a reusable extension-check function.
+    - create_folder_if_not: create a folder if it does not exist.
     - safe_rmtree: remove folder with exception handling.
 """
 import os
+import re
 import shutil
+import fnmatch
+
+from pathlib import Path
 
 
 def is_hidden(file_name: str) -> bool:
@@ -23,7 +31,53 @@ def is_hidden(file_name: str) -> bool:
     Returns:
         bool: True if a file is hidden, False elsewhere
     """
-    return True if file_name.startswith('.') else False
+    return file_name.startswith('.')
+
+def scan_dir(root_dir: str) -> tuple:
+    """
+    Get directory and file lists in a directory with a single scan.
+
+    Args:
+        root_dir (str): Target directory
+
+    Returns:
+        tuple: A tuple of (directory list, file list)
+    """
+    dir_list = list()
+    file_list = list()
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dir_list.append(entry.name)
+            else:
+                file_list.append(entry.name)
+
+    return dir_list, file_list
+
+def walk_files(root_dir: str, follow_symlinks=False, skip_hidden=False):
+    """
+    Walk a directory tree recursively and yield os.DirEntry objects of the files.
+    The entries are streamed with a generator, so the memory usage is constant for huge trees.
+
+    Args:
+        root_dir (str): Target directory to walk
+        follow_symlinks (bool, optional): Decide whether symbolic links are followed while walking. Defaults to False.
+        skip_hidden (bool, optional): Decide whether hidden files and directories are skipped. Defaults to False.
+
+    Yields:
+        os.DirEntry: A file entry with name, path and cached stat information
+    """
+    stack = [root_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if skip_hidden and entry.name[0]=='.':
+                    continue
+
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    stack.append(entry.path)
+                else:
+                    yield entry
 
 def extract_directory(root_dir: str) -> list:
     """
@@ -35,19 +89,26 @@ def extract_directory(root_dir: str) -> list:
     Returns:
         list: Extracted directory list
     """
-    return [file for file in os.listdir(root_dir) if os.path.isdir(root_dir + file)]
+    return scan_dir(root_dir)[0]
 
-def extract_file(root_dir: str) -> list:
+def extract_file(root_dir: str, pattern=None) -> list:
     """
     Get file list in a directory.
+    If a glob pattern is given, it is compiled once to a regex and the non-matching names are filtered out during the scan.
 
     Args:
         root_dir (str): Target directory
+        pattern (str, optional): Glob pattern the file names must match. Defaults to None.
 
     Returns:
         list: Extracted file list
     """
-    return [file for file in os.listdir(root_dir) if os.path.isfile(root_dir + file)]
+    if pattern is None:
+        return scan_dir(root_dir)[1]
+
+    regex = re.compile(fnmatch.translate(pattern))
+    with os.scandir(root_dir) as entries:
+        return [entry.name for entry in entries if entry.is_file(follow_symlinks=False) and regex.match(entry.name)]
 
 def expand_relative_path(path: str) -> str:
     """
@@ -59,16 +120,7 @@ def expand_relative_path(path: str) -> str:
     Returns:
         str: Normalized absolute path
     """
-    if path.startswith("~"):
-        path = os.path.expanduser(path)
-
-    elif path.startswith(os.path.pardir):
-        path = os.path.join(os.path.abspath(os.path.pardir), path[len(os.path.pardir)+1:])
-
-    elif path.startswith(os.path.curdir):
-        path = os.path.join(os.path.abspath(os.path.curdir), path[len(os.path.curdir)+1:])
-    
-    return os.path.normcase(path)
+    return os.path.normcase(str(Path(path).expanduser().resolve(strict=False)))
 
 def check_file_extension(file_path: str, ext_list) -> bool:
     """
@@ -84,10 +136,37 @@ def check_file_extension(file_path: str, ext_list) -> bool:
     if isinstance(ext_list, str):
         ext_list = [ext_list]
 
-    if any([file_path.lower().endswith(f'.{ext}') for ext in ext_list]):
-        return True
-    else:
-        return False
+    return file_path.lower().endswith(tuple(f'.{ext}' for ext in ext_list))
+
+def extension_checker(ext_list):
+    """
+    Build a reusable extension-check function with the suffix tuple prebuilt.
+    Useful to hoist the tuple construction of check_file_extension out of a loop over many paths.
+
+    Args:
+        ext_list (str or Iterable): An extension string or list with only lowercase the target file path must have
+
+    Returns:
+        Callable: A function taking a file path and returning True if the path ends with the given extensions
+    """
+    if isinstance(ext_list, str):
+        ext_list = [ext_list]
+
+    suffixes = tuple(f'.{ext}' for ext in ext_list)
+    def check(file_path: str) -> bool:
+        return file_path.lower().endswith(suffixes)
+
+    return check
+
+def create_folder_if_not(path: str):
+    """
+    Create a folder if it does not exist.
+    os.makedirs with exist_ok covers the existence check in one call, avoiding a separate stat and the race between check and creation.
+
+    Args:
+        path (str): Target directory
+    """
+    os.makedirs(path, exist_ok=True)
 
 def safe_rmtree(path: str):
     """
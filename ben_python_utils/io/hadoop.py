@@ -3,16 +3,24 @@ This module provide some utilities about Hadoop Ecosystem I/O.
 
 Functions:
     - get_hdfs_url: create an URL of HDFS api form.
+    - hdfs_url_builder: build a reusable HDFS URL composer.
+    - get_hdfs_file_status: list an HDFS directory with a mtime-invalidated cache.
     - extract_directory: extract directory list in a directory.
     - upload_hdfs_file: upload a file into HDFS system.
     - download_hdfs_file: download files from HDFS system.
     - get_hive_connection: set connection with a Hive database.
+    - hive_connection: context manager keeping a Hive connection over a block.
     - get_dataframe_from_hive: query Hive DB with given HiveQL statement.
 """
 import os
-import time
+import shutil
 import requests
 import pandas as pd
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib3.util import Retry
 from pyhive import hive
 
 from ..processing.basic import check_type_dict_value
@@ -39,6 +47,73 @@ def get_hdfs_url(hadoop_info: dict, hdfs_dir_path: str, op: str) -> str:
     """
     return f"http://{hadoop_info['IP']}:{hadoop_info['PORT']}/webhdfs/v1{hdfs_dir_path}?op={op}&user.name={hadoop_info['USER']}&doas={hadoop_info['USER']}"
 
+def hdfs_url_builder(hadoop_info: dict):
+    """
+    Build a reusable HDFS URL composer with the base components prebuilt.
+    Useful to hoist the repeated dict lookups of get_hdfs_url out of a loop over many paths.
+
+    Args:
+        hadoop_info (dict):
+            Parameter dictionary for hadoop information
+            Keys to be included: USER, PASSWORD, IP, PORT and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '8020'}
+
+    Returns:
+        Callable: A function taking (hdfs_dir_path, op) and returning the composed URL string
+    """
+    base = f"http://{hadoop_info['IP']}:{hadoop_info['PORT']}/webhdfs/v1"
+    suffix = f"&user.name={hadoop_info['USER']}&doas={hadoop_info['USER']}"
+    def build(hdfs_dir_path: str, op: str) -> str:
+        return f"{base}{hdfs_dir_path}?op={op}{suffix}"
+
+    return build
+
+_session = None
+
+def _get_session() -> requests.Session:
+    # lazy module-level session with keep-alive and a pooled HTTP adapter
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+    return _session
+
+_liststatus_cache = dict()
+
+def get_hdfs_file_status(hadoop_info: dict, hdfs_dir_path: str, session=None) -> list:
+    """
+    List an HDFS directory, caching the LISTSTATUS response per directory.
+    The directory modification time from GETFILESTATUS is used as an invalidation token,
+    so a listing of an unchanged directory costs one light round-trip instead of a full LISTSTATUS.
+
+    Args:
+        hadoop_info (dict):
+            Parameter dictionary for hadoop information
+            Keys to be included: USER, PASSWORD, IP, PORT and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '8020'}
+
+        hdfs_dir_path (str): Target HDFS directory path to list
+        session (requests.Session, optional): Session to reuse for the HTTP calls. Defaults to None.
+
+    Returns:
+        list: FileStatus dictionary list of the directory entries
+    """
+    http = session if session is not None else _get_session()
+    dir_mtime = http.get(get_hdfs_url(hadoop_info, hdfs_dir_path, 'GETFILESTATUS')).json()['FileStatus']['modificationTime']
+
+    cache_key = (hadoop_info['IP'], hadoop_info['PORT'], hdfs_dir_path)
+    cached = _liststatus_cache.get(cache_key)
+    if cached is not None and cached[0]==dir_mtime:
+        return cached[1]
+
+    file_status = http.get(get_hdfs_url(hadoop_info, hdfs_dir_path, 'LISTSTATUS')).json()['FileStatuses']['FileStatus']
+    _liststatus_cache[cache_key] = (dir_mtime, file_status)
+
+    return file_status
+
 def upload_hdfs_file(hadoop_info: dict, hdfs_dir_path: str, upload_data: object) -> str:
     """
     Upload a file into HDFS system.
@@ -59,8 +134,9 @@ def upload_hdfs_file(hadoop_info: dict, hdfs_dir_path: str, upload_data: object)
     if not check_type_dict_value(hadoop_info, str):
         return None
     
-    url = get_hdfs_url(hdfs_dir_path + upload_data, 'CREATE') + "&overwrite=true"
-    response = requests.put(url, data=open(upload_data, 'rb').read(), auth=(hadoop_info['USER'], hadoop_info['PASSWORD']), headers={'content-type': 'application/octet-stream'})
+    url = get_hdfs_url(hadoop_info, hdfs_dir_path + upload_data, 'CREATE') + "&overwrite=true"
+    with open(upload_data, 'rb') as f:
+        response = _get_session().put(url, data=f, auth=(hadoop_info['USER'], hadoop_info['PASSWORD']), headers={'content-type': 'application/octet-stream'})
 
     try:
         print(response.json())
@@ -69,48 +145,64 @@ def upload_hdfs_file(hadoop_info: dict, hdfs_dir_path: str, upload_data: object)
 
     return response.text
 
-def download_hdfs_file(hadoop_info: dict, hdfs_dir_path: str, local_dir_path: str):
+def download_hdfs_file(hadoop_info: dict, hdfs_dir_path: str, local_dir_path: str, max_workers=8):
     """
     Download files from HDFS system.
+    The HDFS tree is walked once to enumerate the files, then the downloads run in parallel threads sharing one session.
 
     Args:
         hadoop_info (dict):
             Parameter dictionary for hadoop information
             Keys to be included: USER, PASSWORD, IP, PORT and Values must be given by string variable
-            
+
             e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '8020'}
 
         hdfs_dir_path (str): Target HDFS data path to download
         local_dir_path (str): Local data path to save
+        max_workers (int, optional): The number of parallel download threads. Defaults to 8.
     """
-    # create target folder
-    target_file_path = os.path.join(local_dir_path, hdfs_dir_path.split('/')[-1])
-    os.makedirs(target_file_path, exist_ok=True)
-
     with requests.Session() as s:
-        s.auth = (hadoop_info['USER'], hadoop_info['PW'])
+        s.auth = (hadoop_info['USER'], hadoop_info['PASSWORD'])
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+        s.mount('http://', requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry))
 
-        # file search
-        for file in s.get(get_hdfs_url(hdfs_dir_path, 'LISTSTATUS')).json()['FileStatuses']['FileStatus']:
-            save_path = os.path.join(target_file_path, file['pathSuffix'])
+        # walk the HDFS tree with a work queue and collect (HDFS file path, local save path) pairs
+        download_list = list()
+        dir_queue = deque([hdfs_dir_path])
+        while dir_queue:
+            current_dir_path = dir_queue.popleft()
+            target_file_path = os.path.join(local_dir_path, current_dir_path.split('/')[-1])
+            os.makedirs(target_file_path, exist_ok=True)
 
-            if file['type']!='FILE':
-                download_hdfs_file(hadoop_info, f"{hdfs_dir_path}/{file['pathSuffix']}", local_dir_path)
+            # scan the local target folder once instead of a stat call per remote file
+            with os.scandir(target_file_path) as entries:
+                existing_files = {entry.name for entry in entries}
 
-            if os.path.exists(save_path):
-                continue
+            for file in get_hdfs_file_status(hadoop_info, current_dir_path, session=s):
+                file_path = f"{current_dir_path}/{file['pathSuffix']}"
 
+                if file['type']!='FILE':
+                    dir_queue.append(file_path)
+                elif file['pathSuffix'] not in existing_files:
+                    download_list.append((file_path, os.path.join(target_file_path, file['pathSuffix'])))
+
+        build_url = hdfs_url_builder(hadoop_info)
+        def download_one(download_target):
+            file_path, save_path = download_target
             try:
-                # file save to local
-                file_save_path = f"{hdfs_dir_path}/{file['pathSuffix']}"
-                with open(file_save_path, 'wb') as f:
-                    f.write(s.get(get_hdfs_url(file_save_path, "OPEN")).content)
+                # file save to local with streaming
+                with s.get(build_url(file_path, 'OPEN'), stream=True) as response:
+                    response.raise_for_status()
+                    with open(save_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, f, length=1024*1024)
 
-                print(f"Downloaded: {file_save_path}")
-                time.sleep(1.0)
+                print(f"Downloaded: {file_path}")
             except Exception as e:
                 print(e)
 
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(download_one, download_list))
+
 def get_hive_connection(hive_info: dict, hive_config: dict) -> hive.Connection:
     """
     Set connection with a Hive database.
@@ -146,6 +238,32 @@ def get_hive_connection(hive_info: dict, hive_config: dict) -> hive.Connection:
     
     return hive.Connection(host=hive_info['IP'], port=hive_info['PORT'], username=hive_info['USER'], password=hive_info['PASSWORD'], auth='LDAP', configuration=hive_config)
 
+@contextmanager
+def hive_connection(hive_info: dict, hive_config: dict):
+    """
+    Context manager holding one Hive connection over a block of queries.
+    Reusing a single connection amortizes the authentication handshake, which dominates short queries.
+
+    Args:
+        hive_info (dict):
+            Parameter dictionary for hive database information
+            Keys to be included: USER, PASSWORD, IP, PORT and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '10000'}
+
+        hive_config (dict):
+            Configuration dictionary of hive database
+
+    Yields:
+        hive.Connection: Hive connection object, closed when the block exits
+    """
+    conn = get_hive_connection(hive_info, hive_config)
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+
 def get_dataframe_from_hive(hive_ql: str, conn: hive.Connection) -> pd.DataFrame:
     """
     Querys Hive datadase with given HiveQL statement and returns data with pd.DataFrame form.
@@ -157,4 +275,16 @@ def get_dataframe_from_hive(hive_ql: str, conn: hive.Connection) -> pd.DataFrame
     Returns:
         pd.DataFrame: Result of query
     """
-    return pd.read_sql(hive_ql, conn)
+    cursor = conn.cursor()
+    cursor.arraysize = 10000
+    cursor.execute(hive_ql)
+
+    columns = [desc[0] for desc in cursor.description]
+    rows = list()
+    while True:
+        batch = cursor.fetchmany()
+        if not batch:
+            break
+        rows.extend(batch)
+
+    return pd.DataFrame(rows, columns=columns)
@@ -2,54 +2,334 @@
 This module provide some utilities about Oracle database I/O.
 
 Functions:
+    - configure: tune the oracledb fetch defaults for DataFrame workloads.
+    - get_oracle_pool: get a cached connection pool of an Oracle database.
     - get_oracle_connection: set connection with a Oracle database.
+    - shutdown_oracle_pools: close all cached Oracle connection pools.
+    - oracle_connection: context manager keeping an Oracle connection over a block.
+    - get_oracle_pool_async: get a cached async connection pool of an Oracle database.
     - get_dataframe_from_oracle: query OracleDB with given SQL statement.
+    - get_dataframe_from_oracle_async: query OracleDB asynchronously with given SQL statement.
+    - execute_many_from_oracle: execute a statement once per parameter set in one round trip.
+    - count_from_oracle: count rows of a table on the server side.
+    - aggregate_from_oracle: run a group-by aggregation on the server side.
     - close_connection: close connection from a oracle database.
 """
+import asyncio
 import oracledb
+import numpy as np
 import pandas as pd
 
+from contextlib import contextmanager
+
 from ..processing.basic import check_type_dict_value
 
+def configure(fetch_lobs=False, fetch_decimals=False):
+    """
+    Tune the oracledb fetch defaults for DataFrame workloads.
+    With fetch_lobs False, LOB columns arrive as str/bytes directly instead of LOB handles needing an extra read round trip per value.
+    With fetch_decimals False, NUMBER columns arrive as float instead of decimal.Decimal, which is much faster to convert downstream
+    but loses precision beyond ~15 digits; pass fetch_decimals=True for data needing exact decimals.
+
+    Args:
+        fetch_lobs (bool, optional): Decide whether LOB columns are fetched as LOB handles. Defaults to False.
+        fetch_decimals (bool, optional): Decide whether NUMBER columns are fetched as decimal.Decimal. Defaults to False.
+    """
+    oracledb.defaults.fetch_lobs = fetch_lobs
+    oracledb.defaults.fetch_decimals = fetch_decimals
+
+configure()
+
+def _normalize_info(oracle_info: dict) -> dict:
+    # accept both lowercase and uppercase key conventions with one shared contract
+    return {key.upper(): value for key, value in oracle_info.items()}
+
+_pool_cache = dict()
+
+def get_oracle_pool(oracle_info: dict, min_size=2, max_size=10, increment=1) -> oracledb.ConnectionPool:
+    """
+    Get a connection pool of an Oracle database.
+    The pool is created once per (dsn, user) and cached at module level,
+    so acquiring a connection skips the TCP/authentication setup after the first call.
+
+    Args:
+        oracle_info (dict):
+            Parameter dictionary for oracle database
+            Keys to be included: USER, PASSWORD, IP, PORT, SERVICE and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '3306', 'SERVICE': 'service'}
+
+        min_size (int, optional): The minimum number of pooled connections. Defaults to 2.
+        max_size (int, optional): The maximum number of pooled connections. Defaults to 10.
+        increment (int, optional): The number of connections to add when the pool grows. Defaults to 1.
+
+    Returns:
+        oracledb.ConnectionPool: OracleDB connection pool object
+    """
+    oracle_info = _normalize_info(oracle_info)
+    dsn = f"{oracle_info['IP']}:{oracle_info['PORT']}/{oracle_info['SERVICE']}"
+    cache_key = (dsn, oracle_info['USER'])
+
+    pool = _pool_cache.get(cache_key)
+    if pool is None:
+        pool = oracledb.create_pool(user=oracle_info['USER'], password=oracle_info['PASSWORD'], dsn=dsn, min=min_size, max=max_size, increment=increment, getmode=oracledb.POOL_GETMODE_WAIT, stmtcachesize=50)
+        _pool_cache[cache_key] = pool
+
+    return pool
+
 def get_oracle_connection(oracle_info: dict) -> oracledb.Connection:
     """
     Set connection with an Oracle database.
+    The connection is acquired from a cached pool, avoiding a new physical connection per call.
 
     Args:
         oracle_info (dict):
             Parameter dictionary for oracle database
-            Keys to be included: USER, PASSWORD, ip, PORT, SERVICE and Values must be given by string variable
-            
-            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '3306', SERVICE: 'service'}
+            Keys to be included: USER, PASSWORD, IP, PORT, SERVICE and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '3306', 'SERVICE': 'service'}
 
     Returns:
         oracledb.Connection: OracleDB connection object
     """
     if not check_type_dict_value(oracle_info, str):
         return None
-    
-    return oracledb.connect(user=oracle_info['USER'], password=oracle_info['PASSWORD'], dsn=f"{oracle_info['IP']}:{oracle_info['PORT']}/{oracle_info['SERVICE']}")
 
-def get_dataframe_from_oracle(sql: str, conn: oracledb.Connection) -> pd.DataFrame:
+    return get_oracle_pool(oracle_info).acquire()
+
+_async_pool_cache = dict()
+_async_pool_lock = asyncio.Lock()
+
+async def get_oracle_pool_async(oracle_info: dict, min_size=2, max_size=10, increment=1) -> oracledb.AsyncConnectionPool:
+    """
+    Get an async connection pool of an Oracle database.
+    The pool is created once per (dsn, user) and cached at module level; creation is serialized
+    with a lock so concurrent first calls do not open duplicate pools.
+
+    Args:
+        oracle_info (dict):
+            Parameter dictionary for oracle database
+            Keys to be included: USER, PASSWORD, IP, PORT, SERVICE and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '3306', 'SERVICE': 'service'}
+
+        min_size (int, optional): The minimum number of pooled connections. Defaults to 2.
+        max_size (int, optional): The maximum number of pooled connections. Defaults to 10.
+        increment (int, optional): The number of connections to add when the pool grows. Defaults to 1.
+
+    Returns:
+        oracledb.AsyncConnectionPool: OracleDB async connection pool object
+    """
+    oracle_info = _normalize_info(oracle_info)
+    dsn = f"{oracle_info['IP']}:{oracle_info['PORT']}/{oracle_info['SERVICE']}"
+    cache_key = (dsn, oracle_info['USER'])
+
+    async with _async_pool_lock:
+        pool = _async_pool_cache.get(cache_key)
+        if pool is None:
+            pool = oracledb.create_pool_async(user=oracle_info['USER'], password=oracle_info['PASSWORD'], dsn=dsn, min=min_size, max=max_size, increment=increment, getmode=oracledb.POOL_GETMODE_WAIT)
+            _async_pool_cache[cache_key] = pool
+
+    return pool
+
+async def get_dataframe_from_oracle_async(sql: str, pool: oracledb.AsyncConnectionPool, chunksize=10000) -> pd.DataFrame:
+    """
+    Querys OracleDB asynchronously with given SQL statement and returns data with pd.DataFrame form.
+    Awaiting the execute/fetch round-trips lets many independent queries overlap with asyncio.gather.
+
+    Args:
+        sql (str): SQL statement to query
+        pool (oracledb.AsyncConnectionPool): OracleDB async connection pool object
+        chunksize (int, optional): The number of rows to fetch per round-trip. Defaults to 10000.
+
+    Returns:
+        pd.DataFrame: Result of the query
+    """
+    async with pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = chunksize
+        cursor.prefetchrows = chunksize
+        await cursor.execute(sql)
+
+        columns = [desc[0] for desc in cursor.description]
+        dtypes = [_dtype_map.get(desc[1], object) for desc in cursor.description]
+        chunks = list()
+        while True:
+            rows = await cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            chunks.append(_rows_to_dataframe(rows, columns, dtypes))
+
+    if len(chunks)==0:
+        return pd.DataFrame(columns=columns)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def shutdown_oracle_pools():
+    """
+    Close all cached Oracle connection pools.
+    """
+    while _pool_cache:
+        _pool_cache.popitem()[1].close(force=True)
+
+@contextmanager
+def oracle_connection(oracle_info: dict):
+    """
+    Context manager holding one Oracle connection over a block of queries.
+    Reusing a single connection amortizes the connection setup cost, which dominates short queries.
+
+    Args:
+        oracle_info (dict):
+            Parameter dictionary for oracle database
+            Keys to be included: USER, PASSWORD, IP, PORT, SERVICE and Values must be given by string variable
+
+            e.g. {'USER': 'user', 'PASSWORD': 'password', 'IP': '127.0.0.1', 'PORT': '3306', 'SERVICE': 'service'}
+
+    Yields:
+        oracledb.Connection: OracleDB connection object, closed when the block exits
+    """
+    conn = get_oracle_connection(oracle_info)
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            close_connection(conn)
+
+# dtype per Oracle column type; anything unmapped stays a Python object column
+_dtype_map = {
+    oracledb.DB_TYPE_NUMBER: np.float64,
+    oracledb.DB_TYPE_BINARY_FLOAT: np.float64,
+    oracledb.DB_TYPE_BINARY_DOUBLE: np.float64,
+    oracledb.DB_TYPE_DATE: 'datetime64[ns]',
+    oracledb.DB_TYPE_TIMESTAMP: 'datetime64[ns]',
+}
+
+def _rows_to_dataframe(rows, columns, dtypes) -> pd.DataFrame:
+    # build typed arrays per column directly, skipping the row-by-row type
+    # inference of the DataFrame constructor; numeric columns stream straight
+    # into a preallocated buffer without an intermediate Python list
+    data = dict()
+    for i, (column, dtype) in enumerate(zip(columns, dtypes)):
+        if np.dtype(dtype).kind in 'fi':
+            data[column] = np.fromiter((row[i] for row in rows), dtype=dtype, count=len(rows))
+        else:
+            data[column] = np.asarray([row[i] for row in rows], dtype=dtype)
+
+    return pd.DataFrame(data, copy=False)
+
+def get_dataframe_from_oracle(sql: str, conn: oracledb.Connection, params=None, chunksize=10000, stream=False) -> pd.DataFrame:
     """
     Querys OracleDB with given SQL statement and returns data with pd.DataFrame form.
+    The rows are fetched with chunksize-bounded batches instead of one fetchall, keeping memory bounded on large results.
+    Variable filters should be given by bind parameters (e.g. "WHERE id = :id" with params={'id': 42})
+    instead of string formatting, so Oracle reuses the parsed statement across calls.
 
     Args:
         sql (str): SQL statement to query
         conn (oracledb.Connection): OracleDB connection object
+        params (dict or list, optional): Bind parameters of the SQL statement. Defaults to None.
+        chunksize (int, optional): The number of rows to fetch per round-trip. Defaults to 10000.
+        stream (bool, optional): Decide whether a DataFrame generator is returned by chunk instead of one merged DataFrame. Defaults to False.
 
     Returns:
-        pd.DataFrame: Result of the query
+        pd.DataFrame or Generator: Result of the query, a DataFrame generator per chunk if stream is True
+    """
+    cursor = conn.cursor()
+    cursor.arraysize = chunksize
+    cursor.prefetchrows = chunksize
+    cursor.execute(sql, params or {})
+
+    columns = [desc[0] for desc in cursor.description]
+    dtypes = [_dtype_map.get(desc[1], object) for desc in cursor.description]
+
+    def generate_chunk():
+        try:
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield _rows_to_dataframe(rows, columns, dtypes)
+        finally:
+            cursor.close()
+
+    if stream:
+        return generate_chunk()
+
+    chunks = [chunk for chunk in generate_chunk()]
+    if len(chunks)==0:
+        return pd.DataFrame(columns=columns)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def execute_many_from_oracle(sql: str, param_seq: list, conn: oracledb.Connection, batch_errors=False) -> int:
+    """
+    Execute the same DML statement once per parameter set with a single array-bind round trip.
+    Running N executes in a Python loop pays the network round trip N times; executemany pipelines them into one.
+
+    Args:
+        sql (str): SQL statement to execute with bind placeholders
+        param_seq (list): A list of bind parameter sets, one per execution
+        conn (oracledb.Connection): OracleDB connection object
+        batch_errors (bool, optional): Decide whether row-level errors are collected instead of aborting the batch. Defaults to False.
+
+    Returns:
+        int: The number of affected rows
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(sql, param_seq, batcherrors=batch_errors)
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+def count_from_oracle(table: str, conn: oracledb.Connection, where=None, params=None) -> int:
+    """
+    Count rows of a table on the server side.
+    Pushing the count down to Oracle avoids transferring the rows just to measure them.
+
+    Args:
+        table (str): Target table name
+        conn (oracledb.Connection): OracleDB connection object
+        where (str, optional): WHERE clause body to filter the rows. Defaults to None.
+        params (dict or list, optional): Bind parameters of the WHERE clause. Defaults to None.
+
+    Returns:
+        int: The number of rows
     """
+    sql = f"SELECT COUNT(*) FROM {table}" + (f" WHERE {where}" if where else "")
     cursor = conn.cursor()
-    cursor.execute(sql)
+    try:
+        cursor.execute(sql, params or {})
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+def aggregate_from_oracle(table: str, group_by: list, aggs: dict, conn: oracledb.Connection, where=None, params=None) -> pd.DataFrame:
+    """
+    Run a group-by aggregation on the server side and return the result with pd.DataFrame form.
+    Prefer this over fetching the full table and calling DataFrame.groupby when most rows would be discarded,
+    since the database aggregates with its own indexes and only the grouped result crosses the network.
 
-    df = pd.DataFrame(cursor.fetchall())
+    Args:
+        table (str): Target table name
+        group_by (list): Column name(s) to group by
+        aggs (dict):
+            Aggregation dictionary with key as the output alias and value as a (function, column) tuple
+
+            e.g. {'CNT': ('COUNT', '*'), 'AVG_PRICE': ('AVG', 'PRICE')}
+
+        conn (oracledb.Connection): OracleDB connection object
+        where (str, optional): WHERE clause body to filter the rows. Defaults to None.
+        params (dict or list, optional): Bind parameters of the WHERE clause. Defaults to None.
 
-    if df.shape[0]!=0:
-        df.columns = [desc[0] for desc in cursor.description]
+    Returns:
+        pd.DataFrame: Aggregated result of the query
+    """
+    select = ", ".join(list(group_by) + [f"{func}({column}) AS {alias}" for alias, (func, column) in aggs.items()])
+    sql = f"SELECT {select} FROM {table}" + (f" WHERE {where}" if where else "") + f" GROUP BY {', '.join(group_by)}"
 
-    return df
+    return get_dataframe_from_oracle(sql, conn, params=params)
 
 def close_connection(conn_object: oracledb.Connection):
     """
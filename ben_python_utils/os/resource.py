@@ -8,14 +8,28 @@ Functions:
 import os
 import psutil
 
+_process = None
+_core_count = None
+
+def _current_process() -> psutil.Process:
+    # lazy module-level singleton, so monitoring loops do not reopen the process handle per call
+    global _process
+    if _process is None:
+        _process = psutil.Process(os.getpid())
+
+    return _process
+
 
 def cpu_check():
     """
     Check the CPU usage.
     Prints the number of CPU core and general CPU usage percent.
     """
-    # show CPU core count
-    print(f"# of cores: {psutil.cpu_count(logical=False)}")
+    # show CPU core count (cached, since it doesn't change within a run)
+    global _core_count
+    if _core_count is None:
+        _core_count = psutil.cpu_count(logical=False)
+    print(f"# of cores: {_core_count}")
 
     # general CPU usage
     print(f"CPU_usage_percent: {psutil.cpu_percent()}%")
@@ -24,10 +38,10 @@ def cpu_check():
 def memory_check():
     """
     Check the memory usage.
-    Prints general RAM usage percent and current RAM usage as KB.
+    Prints general RAM usage percent and current RAM usage as MB.
     """
     # general RAM usage
-    print(f"memory_usage_percent: {dict(psutil.virtual_memory()._asdict())['percent']}%")
+    print(f"memory_usage_percent: {psutil.virtual_memory().percent}%")
 
-    # current process RAM usage: current_process_memory_usage_as_KB
-    print(f"Current memory KB   : {psutil.Process(os.getpid()).memory_info()[0] / 2. ** 20: 9.3f} KB")
+    # current process RAM usage: current_process_memory_usage_as_MB
+    print(f"Current memory MB   : {_current_process().memory_info().rss / 2. ** 20: 9.3f} MB")
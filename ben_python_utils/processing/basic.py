@@ -11,9 +11,13 @@ Functions:
     - element_count: calculate the element count of an iterable object.
     - get_variable_name: extract variable name to a string.
 """
-import copy
+import re
 import datetime
 
+import numpy as np
+
+from collections import Counter
+
 
 def check_type_dict_value(check_dict: dict, check_type: type, dict_keys=None) -> bool:
     """
@@ -28,18 +32,18 @@ def check_type_dict_value(check_dict: dict, check_type: type, dict_keys=None) ->
         bool: False If any value of dictionary is not matches to the given type
     """
     if dict_keys is None:
-        target_key = check_dict.keys()
+        target_values = check_dict.values()
     elif not isinstance(dict_keys, list):
-        target_key = [dict_keys]
+        target_values = [check_dict[dict_keys]]
     else:
-        target_key = dict_keys
-    
-    for key in target_key:
-        if not isinstance(check_dict[key], check_type):
-            print("Type of target values must be {}, but some of value has {}".format(check_type, type(check_dict[key])))
-            return False
-    
-    return True
+        target_values = [check_dict[key] for key in dict_keys]
+
+    if all(isinstance(value, check_type) for value in target_values):
+        return True
+
+    bad_value = next(value for value in target_values if not isinstance(value, check_type))
+    print("Type of target values must be {}, but some of value has {}".format(check_type, type(bad_value)))
+    return False
         
 def check_type_list_element(check_list: list, check_type: type, index_list=None) -> bool:
     """
@@ -67,7 +71,7 @@ def check_type_list_element(check_list: list, check_type: type, index_list=None)
     else:
         idx_list = index_list
 
-    check_idx_list = [idx for idx in idx_list if idx >= len(idx_list)]
+    check_idx_list = [idx for idx in idx_list if idx >= len(check_list)]
     if len(check_idx_list) > 0:
         raise ValueError(f'Invalid index found in index_list: {str(check_idx_list)}')
 
@@ -89,12 +93,10 @@ def convert_type_list_element(target_list: list, convert_type: type) -> bool:
     Returns:
         bool: False If any value of list is not matches to the given type
     """
-    converted_list = copy.deepcopy(target_list)
-    for i, element in enumerate(target_list):
-        if not isinstance(element, convert_type):
-            converted_list[i] = convert_type(element)
+    return [element if isinstance(element, convert_type) else convert_type(element) for element in target_list]
 
-    return converted_list
+# timedelta string form of '[days.]hours:minutes:seconds', compiled once
+_timedelta_regex = re.compile(r'^(?:(\d+)\.)?(\d+):(\d+):(\d+)$')
 
 def convert_string_to_timedelta(string: str) -> datetime.timedelta:
     """
@@ -109,24 +111,13 @@ def convert_string_to_timedelta(string: str) -> datetime.timedelta:
     Returns:
         datetime.timedelta: Converted timedelta object
     """
-    # get days
-    tmp = string.split('.')
-    if len(tmp)==2:
-        days = int(tmp[0])
-        tmp = tmp[1]
-    elif len(tmp)==1:
-        days = 0
-        tmp = tmp[0]
-    else:
+    matched = _timedelta_regex.match(string)
+    if matched is None:
         raise ValueError('{} is not a valid timedelta string'.format(string))
 
-    # get total seconds
-    tmp = tmp.split(':')
-    if len(tmp) != 3:
-        raise ValueError('{} is not a valid timedelta string'.format(string))
-    total_sec = int(tmp[2]) + int(tmp[1]) * 60 + int(tmp[0]) * 3600
+    days, hours, minutes, seconds = matched.groups()
 
-    return datetime.timedelta(days, total_sec)
+    return datetime.timedelta(int(days or 0), int(seconds) + int(minutes) * 60 + int(hours) * 3600)
 
 def get_split_index(data, split_n: int) -> list:
     """
@@ -139,10 +130,7 @@ def get_split_index(data, split_n: int) -> list:
     Returns:
         list: Index list to split the data
     """
-    if isinstance(data, dict):
-        return [int(len(list(data.keys())) * (i + 1) / split_n) for i in range(split_n - 1)]
-    else:
-        return [int(len(data) * (i + 1) / split_n) for i in range(split_n - 1)]
+    return np.linspace(0, len(data), split_n + 1, dtype=np.int64)[1:-1].tolist()
 
 def filter_duplicated_word(text: str, sep=' ', reverse=False) -> str:
     """
@@ -156,17 +144,25 @@ def filter_duplicated_word(text: str, sep=' ', reverse=False) -> str:
     Returns:
         str: String with unique words
     """
+    try:
+        # ASCII fast path: splitting bytes skips the per-token unicode bookkeeping
+        byte_sep = sep.encode('ascii')
+        word_list = text.encode('ascii').split(byte_sep)
+    except UnicodeEncodeError:
+        byte_sep = None
+        word_list = text.split(sep)
+
     if reverse:
-        tmp_list = text.split(sep)[::-1]
-        for word in tmp_list:
-            word_cnt = tmp_list.count(word)
-            if word_cnt > 1:
-                for i in range(word_cnt-1):
-                    tmp_list.pop(tmp_list.index(word))
-                    
-        return sep.join(tmp_list[::-1])
-    else:
-        return sep.join(list(set(text.split(sep))))
+        word_list = word_list[::-1]
+
+    unique_list = list(dict.fromkeys(word_list))
+    if reverse:
+        unique_list.reverse()
+
+    if byte_sep is None:
+        return sep.join(unique_list)
+
+    return byte_sep.join(unique_list).decode('ascii')
 
 def element_count(data) -> dict:
     """
@@ -183,15 +179,8 @@ def element_count(data) -> dict:
     """
     if not hasattr(data, '__iter__'):
         raise TypeError("{} is not iterable".format(type(data)))
-    
-    cnt_dict = dict()
-    for element in data:
-        if element in cnt_dict.keys():
-            cnt_dict[element] += 1
-        else:
-            cnt_dict[element] = 1
-        
-    return cnt_dict
+
+    return dict(Counter(data))
 
 def get_variable_name(variable) -> str:
     """
@@ -5,15 +5,32 @@ Functions:
     - check_df: check if the dataframe has the DataFrame type.
     - check_column: Check if the input columns have a valid type.
     - get_all_duplicate: get all duplicated rows.
+    - get_all_duplicate_mask: get a boolean mask of all duplicated rows.
     - load_dir: load and merge all xls(xlsm, xlsx) or csv files in a directory.
+    - load_dir_iter: load all xls(xlsm, xlsx) or csv files in a directory as a stream of chunks.
     - element_count: calculate the element count of an iterable object.
     - convert_str_column_to_datetime: convert a string-formatted DataFrame column into datetime type.
     - generate_dummy: generate dummies from some columns.
     - drop_column: drop some columns from a DataFrame.
 """
 import os
+import numpy as np
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow  # noqa: F401
+    _csv_engine = 'pyarrow'
+except ImportError:
+    _csv_engine = 'c'
+
+try:
+    import python_calamine  # noqa: F401
+    _excel_engine = 'calamine'
+except ImportError:
+    _excel_engine = None
+
 def check_df(df: pd.DataFrame):
     """
     Check if the input dataframe has a valid type.
@@ -24,7 +41,7 @@ def check_df(df: pd.DataFrame):
     Raises:
         TypeError: If the df is not a DataFrame
     """
-    if not isinstance(df, pd.DataFrame):
+    if type(df) is not pd.DataFrame:
         raise TypeError("Type of target df name must be <class 'pandas.core.frame.DataFrame'>, but {}".format(type(df)))
 
 
@@ -41,12 +58,13 @@ def check_column(columns) -> list:
     Returns:
         list: A list of columns
     """
+    if type(columns) is list:
+        return columns
+
     if isinstance(columns, str):
-        columns = [columns]
-    elif not isinstance(columns, list):
-        raise TypeError("Type of target column name must be <class 'str'> or <class 'list'>, but {}".format(type(columns)))
+        return [columns]
 
-    return columns
+    raise TypeError("Type of target column name must be <class 'str'> or <class 'list'>, but {}".format(type(columns)))
 
 
 def get_all_duplicate(df: pd.DataFrame, column_list: list) -> pd.DataFrame:
@@ -64,29 +82,139 @@ def get_all_duplicate(df: pd.DataFrame, column_list: list) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame with the rows that the target columns are duplicated
     """
+    return df.loc[get_all_duplicate_mask(df, column_list)]
+
+
+def get_all_duplicate_mask(df: pd.DataFrame, column_list: list, out=None) -> np.ndarray:
+    """
+    Get a boolean mask of all duplicated rows as a numpy array.
+    The lower-level counterpart of get_all_duplicate for callers that combine masks with other predicates or filter several objects with one result.
+    With out, the mask is written into a caller-provided preallocated buffer instead of a fresh allocation per call.
+
+    Args:
+        df (pd.DataFrame): Target DataFrame
+        column_list (list): Target column(s) in the DataFrame to extract duplicates
+        out (np.ndarray, optional): Preallocated boolean array of the row count to write the mask into. Defaults to None.
+
+    Raises:
+        ValueError: If the input DataFrame is empty
+
+    Returns:
+        np.ndarray: A boolean array with True on the rows that the target columns are duplicated
+    """
     if len(df)==0:
         raise ValueError('DataFrame is empty')
 
-    return df[df.duplicated(column_list) | df.duplicated(column_list, keep='last')]
+    mask = df.duplicated(column_list, keep=False).to_numpy()
+    if out is None:
+        return mask
+
+    np.copyto(out, mask)
+    return out
+
+
+def _scan_data_files(root_dir: str) -> tuple:
+    """
+    Scan a directory once and classify the loadable data files by extension.
+
+    Args:
+        root_dir (str): Target directory to scan
+
+    Returns:
+        tuple: A tuple of (csv path list, excel path list)
+    """
+    csv_path_list = list()
+    excel_path_list = list()
+    # one splitext and one dict lookup classify each entry; supporting a new format is a one-line addition
+    path_lists = {'.csv': csv_path_list, '.xls': excel_path_list, '.xlsx': excel_path_list, '.xlsm': excel_path_list}
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+
+            target = path_lists.get(os.path.splitext(entry.name)[1].lower())
+            if target is not None:
+                target.append(entry.path)
+
+    return csv_path_list, excel_path_list
 
 
-def load_dir(root_dir: str) -> pd.DataFrame:
+def load_dir(root_dir: str, max_workers=None, dtypes=None, columns=None, cache=False) -> pd.DataFrame:
     """
     Load and merge all xls(xlsm, xlsx) or csv files in a directory.
     Folders in the directory will be ignored.
+    The directory is scanned once and the files are read in parallel threads, since the pandas parsers release the GIL on I/O.
+    Declaring dtypes up-front skips the per-column type-inference scan of every file.
+    With cache, the merged result is kept as '.merged.parquet' in the directory and reloaded in one columnar read while no source file is newer; this needs a parquet engine such as pyarrow installed.
+    The cache only applies to full-width, dtype-inferred loads, so calls with dtypes or columns always read the source files.
 
     Args:
         root_dir (str): Target directory to load
+        max_workers (int, optional): The number of parallel reader threads. Defaults to None.
+        dtypes (dict, optional): Column-to-dtype mapping forwarded to the readers, skipping dtype inference. Defaults to None.
+        columns (list, optional): Column names forwarded as usecols to the readers, so only the needed columns are parsed and allocated. Defaults to None.
+        cache (bool, optional): Decide whether the merged result is cached as a parquet file in the directory. Defaults to False.
 
     Returns:
         pd.DataFrame: A merged DataFrame
     """
-    return pd.concat(
-        [pd.read_csv(root_dir + file) for file in os.listdir(root_dir) if file.split('.')[-1].find('csv') > -1] +
-        [pd.read_excel(root_dir + file) for file in os.listdir(root_dir) if file.split('.')[-1].find('xls') > -1]
-    )
+    csv_path_list, excel_path_list = _scan_data_files(root_dir)
+    if len(csv_path_list)==0 and len(excel_path_list)==0:
+        return pd.DataFrame()
+
+    # narrowed or dtype-overridden reads are never cached: the parquet file holds one
+    # full-width result, which would serve wrong data to calls with other parameters
+    cache = cache and columns is None and dtypes is None
+    if cache:
+        cache_path = os.path.join(root_dir, '.merged.parquet')
+        # the cache stays valid until any source file gets a newer mtime
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= max(os.path.getmtime(path) for path in csv_path_list + excel_path_list):
+            return pd.read_parquet(cache_path)
+
+    # empty groups are skipped entirely, so a pure-CSV directory never touches
+    # read_excel and the openpyxl import it would pull in
+    frames = list()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if len(csv_path_list) > 0:
+            frames += executor.map(lambda path: pd.read_csv(path, engine=_csv_engine, dtype=dtypes, usecols=columns), csv_path_list)
+        if len(excel_path_list) > 0:
+            frames += executor.map(lambda path: pd.read_excel(path, engine=_excel_engine, dtype=dtypes, usecols=columns), excel_path_list)
+
+    # a freshly-read single frame already has a clean RangeIndex, so concat would only copy it
+    merged = frames[0] if len(frames)==1 else pd.concat(frames, ignore_index=True, sort=False)
+    if cache:
+        merged.to_parquet(cache_path)
+
+    return merged
+
+
+def load_dir_iter(root_dir: str, chunksize=100000, dtypes=None, columns=None):
+    """
+    Load all xls(xlsm, xlsx) or csv files in a directory as a stream of DataFrame chunks.
+    CSV files are read in chunksize-row pieces, so peak memory stays around one chunk instead of the merged total.
+    Excel files have no chunked reader in pandas and are yielded one whole file at a time.
+
+    Args:
+        root_dir (str): Target directory to load
+        chunksize (int, optional): The number of rows per yielded CSV chunk. Defaults to 100000.
+        dtypes (dict, optional): Column-to-dtype mapping forwarded to the readers, skipping dtype inference. Defaults to None.
+        columns (list, optional): Column names forwarded as usecols to the readers, so only the needed columns are parsed and allocated. Defaults to None.
+
+    Yields:
+        pd.DataFrame: A chunk of one source file
+    """
+    csv_path_list, excel_path_list = _scan_data_files(root_dir)
+    for path in csv_path_list:
+        # the pyarrow engine does not support chunksize, so the C parser is used here
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=dtypes, usecols=columns)
+
+    for path in excel_path_list:
+        yield pd.read_excel(path, engine=_excel_engine, dtype=dtypes, usecols=columns)
 
 
+# strptime formats that the vectorized ISO8601 parser covers, skipping strptime entirely
+_iso_datetime_formats = frozenset(['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f'])
+
 def convert_str_column_to_datetime(df: pd.DataFrame, columns, datetime_format: str) -> pd.DataFrame:
     """
     Convert a string-formatted DataFrame column into datetime type.
@@ -100,29 +228,47 @@ def convert_str_column_to_datetime(df: pd.DataFrame, columns, datetime_format: s
         pd.DataFrame: A DataFrame with column-converted
     """
     check_df(df)
+    if datetime_format in _iso_datetime_formats:
+        datetime_format = 'ISO8601'
+
     for column in check_column(columns):
-        df.loc[:, column] = pd.to_datetime(df[column], format=datetime_format)
+        # early exit keeps re-runs over already-parsed columns O(1) per column
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            continue
+
+        if df[column].dtype == object:
+            # parse each unique string once and broadcast back, so the cost scales
+            # with the number of unique values instead of the row count; factorize
+            # hashes instead of sorting, so missing values pass through as code -1
+            codes, uniques = pd.factorize(df[column])
+            parsed = pd.to_datetime(uniques, format=datetime_format).to_numpy()
+            # the appended NaT slot is what code -1 broadcasts back as
+            df[column] = np.append(parsed, np.datetime64('NaT'))[codes]
+        else:
+            df[column] = pd.to_datetime(df[column], format=datetime_format)
 
     return df
 
 
-def generate_dummy(df: pd.DataFrame, columns) -> pd.DataFrame:
+def generate_dummy(df: pd.DataFrame, columns, sparse=False, prefix=False) -> pd.DataFrame:
     """
     Generate dummy from some columns.
 
     Args:
         df (pd.DataFrame): Target DataFrame
         columns (list or str): Target column(s) in the DataFrame to generate
+        sparse (bool, optional): Decide whether the dummy columns are backed by SparseArray, which stores only the non-zero positions. Recommended for high-cardinality columns. Defaults to False.
+        prefix (bool, optional): Decide whether the dummy column names are prefixed with the source column name, keeping them unique across columns. Defaults to False.
 
     Returns:
         pd.DataFrame: A DataFrame with dummy columns only
     """
     check_df(df)
-    dummy_df = pd.DataFrame()
-    for column in check_column(columns):
-        dummy_df = pd.concat([dummy_df, pd.get_dummies(df[column], drop_first=True)], axis=1)
+    dummy_list = [pd.get_dummies(df[column], drop_first=True, prefix=column if prefix else None, sparse=sparse, dtype=np.uint8) for column in check_column(columns)]
+    if len(dummy_list)==0:
+        return pd.DataFrame(index=df.index)
 
-    return dummy_df
+    return pd.concat(dummy_list, axis=1)
 
 
 def drop_column(df: pd.DataFrame, columns) -> pd.DataFrame:
@@ -137,8 +283,9 @@ def drop_column(df: pd.DataFrame, columns) -> pd.DataFrame:
         pd.DataFrame: A DataFrame with some column-dropped
     """
     check_df(df)
-    for column in check_column(columns):
-        if column in df.columns:
-            df = df.drop(column, axis=1)
+    existing_columns = set(df.columns)
+    drop_list = [column for column in check_column(columns) if column in existing_columns]
+    if len(drop_list)==0:
+        return df
 
-    return df
+    return df.drop(columns=drop_list)
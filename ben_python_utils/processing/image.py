@@ -3,6 +3,7 @@ This module provide some utilities to handle an image format.
 
 Functions:
     - draw_rectangle_box: Add a rectangle box in a image.
+    - draw_rectangle_boxes: Add several rectangle boxes in a image at once.
     - extract_dcm_meta: extract given meta information from a dicom file.
     - xray_normalize: add normalizing to a xray(grayscale) image.
     - dcm_to_img: convert a dicom format file to a image-format file.
@@ -16,7 +17,7 @@ import SimpleITK as sitk
 import numpy as np
 import matplotlib.pyplot as plt
 
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
 from .basic import check_type_list_element, get_variable_name
 from ..io.file import check_file_extension
 
@@ -40,7 +41,29 @@ def draw_rectangle_box(img: np.ndarray, xmin: int, ymin: int, xmax: int, ymax: i
     
     return img
 
-def extract_dcm_meta(dcm_path: str, meta_list: list, additional_meta_list=None) -> dict:
+def draw_rectangle_boxes(img: np.ndarray, boxes: list, color=(0, 0, 255), thickness=2, comment_texts=None) -> np.ndarray:
+    """
+    Add several rectangle boxes and comment texts in a image at once.
+    cv2 draws on the array in place, so the boxes are stamped without any per-box copy or reassignment.
+
+    Args:
+        img (np.ndarray): Image array to add
+        boxes (list): A list of (xmin, ymin, xmax, ymax) coordinate tuples, one per rectangle
+        color (tuple, optional): The color of rectangles and texts by BGR tuple form. Defaults to (0, 0, 255).
+        thickness (int, optional): The line thickness of the rectangles. Defaults to 2.
+        comment_texts (list, optional): Comment strings added to each rectangle with same color. Defaults to None.
+
+    Returns:
+        np.ndarray: Image array with rectangles
+    """
+    for i, (xmin, ymin, xmax, ymax) in enumerate(boxes):
+        cv2.rectangle(img, (xmin, ymin), (xmax, ymax), color, thickness)
+        if comment_texts is not None and comment_texts[i] is not None:
+            cv2.putText(img, str(comment_texts[i]), (xmin, ymin), cv2.FONT_ITALIC, 1, color, 2)
+
+    return img
+
+def extract_dcm_meta(dcm_path: str, meta_list: list, additional_meta_list=None, dcm=None) -> dict:
     """
     Load a dicom image and extract given meta information.
 
@@ -48,6 +71,7 @@ def extract_dcm_meta(dcm_path: str, meta_list: list, additional_meta_list=None)
         dcm_path (str): Dicom file path to extract meta information
         meta_list (list): Metadata key list to extract, not allowing None value
         additional_meta_list (list, optional): Additional metadata key list to extract, allowing None value. Defaults to None.
+        dcm (pydicom.Dataset, optional): An already-loaded dicom dataset to reuse, skipping the file parse. Defaults to None.
 
     Raises:
         TypeError: If meta_list or additional_meta_list have non-string type element
@@ -55,27 +79,36 @@ def extract_dcm_meta(dcm_path: str, meta_list: list, additional_meta_list=None)
     Returns:
         dict: A key-value set of dicom meta
     """
-    if not check_type_list_element(meta_list, str):
+    if not all(isinstance(meta, str) for meta in meta_list):
         raise TypeError("The all element types of meta_list variable must be <class 'str'>")
-    
-    if not check_file_extension(dcm_path, ['dcm', 'dicom']):
+
+    if dcm is None and not check_file_extension(dcm_path, ['dcm', 'dicom']):
         raise ValueError("dcm_path has wrong extension of dicom format")
-    
+
+    # strip each key once and reuse the result for the parse pruning and the lookups
+    keys = [meta.strip() for meta in meta_list]
+    additional_keys = list()
+    if isinstance(additional_meta_list, list):
+        if not all(isinstance(meta, str) for meta in additional_meta_list):
+            raise TypeError("The all element types of additional_meta_list variable must be <class 'str'>")
+
+        additional_keys = [meta.strip() for meta in additional_meta_list]
+
     try:
-        dcm = pydicom.dcmread(dcm_path, force=True)
+        if dcm is None:
+            # read only the requested tags and stop before the bulk pixel data
+            dcm = pydicom.dcmread(dcm_path, force=True, stop_before_pixels=True, specific_tags=keys + additional_keys)
         try:
-            meta_dict = {meta.strip(): dcm[meta.strip()].value for meta in meta_list}
+            meta_dict = {key: dcm[key].value for key in keys}
         except KeyError:
             return None
 
-        if isinstance(additional_meta_list, list) and not check_type_list_element(additional_meta_list, str):
-            for additional_meta in additional_meta_list:
-                additional_meta = additional_meta.strip()
-                try:
-                    meta_dict[additional_meta] = dcm[additional_meta].value
-                except KeyError:
-                    meta_dict[additional_meta] = None
-    except (RuntimeError, pydicom.errors.InvaliddicomError):
+        for key in additional_keys:
+            try:
+                meta_dict[key] = dcm[key].value
+            except KeyError:
+                meta_dict[key] = None
+    except (RuntimeError, pydicom.errors.InvalidDicomError):
         return None
 
     return meta_dict
@@ -91,13 +124,18 @@ def xray_normalize(img: np.ndarray) -> np.ndarray:
         np.ndarray: normalized image array
         
     """
-    img = np.clip(img, 0, np.percentile(img, 99))
-    img -= img.min()
-    img /= (img.max() - img.min())
-    img *= 255
-    img = img.astype(np.uint8)
+    # introselect partition finds the 99th-percentile cut in O(N) instead of a full sort
+    flat = img.ravel()
+    k = int(0.99 * (flat.size - 1))
+    img = np.clip(img, 0, np.partition(flat, k)[k]).astype(np.float32, copy=False)
 
-    return img
+    # scale in place on the clipped copy, so no further buffers are allocated
+    lo = img.min()
+    scale = 255.0 / (img.max() - lo)
+    np.subtract(img, lo, out=img)
+    np.multiply(img, scale, out=img)
+
+    return img.astype(np.uint8)
 
 def select_dcm_with_meta(meta_list: dict, target_key_list, include_desc_list=list(), exclude_desc_list=list()) -> bool:
     """
@@ -173,7 +211,10 @@ def dcm_to_img(dcm_path: str, img_path: str, target_ext='png', series_idx_range=
         raise ValueError("dcm_path has wrong extension of dicom format")
     
     try:
-        sitk_img = sitk.GetArrayFromImage(sitk.ReadImage(dcm_path, imageIO='GDCMImageIO'))
+        # read-only view over the ITK buffer, skipping a full-volume copy;
+        # image must stay referenced while the view is in use, since the view does not keep it alive
+        image = sitk.ReadImage(dcm_path, imageIO='GDCMImageIO')
+        sitk_img = sitk.GetArrayViewFromImage(image)
     except RuntimeError:
         print(f"DCM file could't be read: {dcm_path}")
         return None
@@ -186,31 +227,26 @@ def dcm_to_img(dcm_path: str, img_path: str, target_ext='png', series_idx_range=
     if series_idx_range[1] is None:
         series_idx_range = (series_idx_range[0], sitk_img.shape[0])
 
-    ext_split = img_path.split(os.path.sep)[-1].split('.')
-    if len(ext_split)==1:
-        img_name = ext_split[0]
-        ext_to_save = target_ext
-    else:
-        if ext_split[0]=='': # hidden data path
-            img_name = '.'.join(ext_split[:2])
-            if len(ext_split)==2:
-                ext_to_save = target_ext
-            else:
-                ext_to_save = ext_split[-1]
-        else:
-            img_name = ext_split[0]
-            ext_to_save = ext_split[-1]
-
-    if not check_file_extension('.'.join([img_name, ext_to_save]), target_ext):
+    img_dir, base_name = os.path.split(img_path)
+    img_name, ext = os.path.splitext(base_name)
+    ext_to_save = ext.lstrip('.') or target_ext
+
+    if not check_file_extension(f'{img_name}.{ext_to_save}', target_ext):
         raise ValueError(f"img_path has wrong extension of image format: {ext_to_save}")
-    
-    for series in range(series_idx_range[0]-1, series_idx_range[1]):
+
+    def save_series(series):
         pixel_array = sitk_img[series, :, :]
 
         ### could add any preprocessing procedures below
         # pixel_array = xray_normalize(pixel_array)
 
-        Image.fromarray(pixel_array).save(os.path.join(os.path.sep.join(img_path.split(os.path.sep)[:-1]), img_name + f"_{series}.{ext_to_save}"))
+        # cv2.imwrite encodes in C++ and handles 16-bit slices natively; compression
+        # level 3 roughly halves the PNG encode time against the default for a modest size increase
+        cv2.imwrite(os.path.join(img_dir, img_name + f"_{series}.{ext_to_save}"), pixel_array, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+
+    # slice encodes are independent and cv2 releases the GIL in the encoder
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(save_series, range(series_idx_range[0]-1, series_idx_range[1])))
 
 def show_dcm_img(dcm_path: str, series_idx_range=(None, None), fig_size=None, num_col=1):
     """
@@ -226,17 +262,21 @@ def show_dcm_img(dcm_path: str, series_idx_range=(None, None), fig_size=None, nu
         ValueError: The second element of series_idx_range is smaller than first one
         TypeError: If fig_size is not a tuple type
     """
-    sitk_img = sitk.GetArrayFromImage(sitk.ReadImage(dcm_path))
+    # parse the file once and reuse the dataset for both metadata and pixels
+    dcm = pydicom.dcmread(dcm_path, force=True)
+    img_stack = dcm.pixel_array
+    if img_stack.ndim==2:
+        img_stack = img_stack[np.newaxis, :, :]
 
     print("[Descriptions]")
-    for meta, value in extract_dcm_meta(dcm_path, ['PatientID', 'Modality', 'Studydate'], ['StudyDescription', 'SeriesDescription', 'BodyPartExamined']).items():
+    for meta, value in extract_dcm_meta(dcm_path, ['PatientID', 'Modality', 'Studydate'], ['StudyDescription', 'SeriesDescription', 'BodyPartExamined'], dcm=dcm).items():
         print(f"{meta}: {value}")
     
     if series_idx_range[0] is None:
         series_idx_range = (1, series_idx_range[1])
     if series_idx_range[1] is None:
-        series_idx_range = (series_idx_range[0], sitk_img.shape[0])
-    
+        series_idx_range = (series_idx_range[0], img_stack.shape[0])
+
     total_plot_cnt = series_idx_range[1] - series_idx_range[0]
     if total_plot_cnt < 0:
         raise ValueError("The first element of series_idx_range must be larger than second one")
@@ -250,11 +290,19 @@ def show_dcm_img(dcm_path: str, series_idx_range=(None, None), fig_size=None, nu
     else:
         fig, axes = plt.subplots(num_row, num_col, figsize=(6*num_col, 6*num_row))
 
+    # normalize all selected slices in one vectorized pass instead of a per-plot call,
+    # keeping the per-slice 99th-percentile cut and min-max scale of xray_normalize
+    stack = img_stack[series_idx_range[0]-1:series_idx_range[1]].astype(np.float32)
+    np.clip(stack, 0, np.percentile(stack, 99, axis=(1, 2), keepdims=True), out=stack)
+    lo = stack.min(axis=(1, 2), keepdims=True)
+    scale = 255.0 / (stack.max(axis=(1, 2), keepdims=True) - lo)
+    np.subtract(stack, lo, out=stack)
+    np.multiply(stack, scale, out=stack)
+    stack = stack.astype(np.uint8)
+
     for i, series in enumerate(range(series_idx_range[0]-1, series_idx_range[1])):
-        pixel_array = sitk_img[series, :, :]
-        
         row_ = i//num_col
         col_ = i%num_col
-        
-        axes[row_][col_].imshow(xray_normalize(pixel_array), 'gray')
+
+        axes[row_][col_].imshow(stack[i], 'gray')
         axes[row_][col_].set_title(f"[Image {series + 1}]")
\ No newline at end of file